@@ -1,5 +1,6 @@
 from datetime import datetime
 from app import db
+from sqlalchemy import inspect, text
 from flask_login import UserMixin
 from werkzeug.security import generate_password_hash, check_password_hash
 
@@ -30,11 +31,58 @@ class User(UserMixin, db.Model):
 
 class Dataset(db.Model):
     __tablename__ = 'datasets'
+    __table_args__ = (
+        # Serves both the owner filter and the dashboard's newest-first ordering.
+        db.Index('ix_datasets_user_id_uploaded_at', 'user_id', 'uploaded_at'),
+    )
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     filename = db.Column(db.String, nullable=False)
     original_filename = db.Column(db.String, nullable=False)
     file_size = db.Column(db.Integer, nullable=False)
+    sha256 = db.Column(db.String(64), nullable=True)
+    columns_json = db.Column(db.Text, nullable=True)
+    detected_target = db.Column(db.String, nullable=True)
     uploaded_at = db.Column(db.DateTime, default=datetime.now)
     profile_generated = db.Column(db.Boolean, default=False)
     profile_path = db.Column(db.String, nullable=True)
+    profile_full = db.Column(db.Boolean, default=False)
+    profile_full_requested = db.Column(db.Boolean, default=False)
+    profile_status = db.Column(db.String(20), nullable=True)
+    profile_error = db.Column(db.String, nullable=True)
+    profile_started_at = db.Column(db.DateTime, nullable=True)
+    parquet_path = db.Column(db.String, nullable=True)
+    missing_cells = db.Column(db.String, nullable=True)
+    missing_cells_percent = db.Column(db.String, nullable=True)
+    duplicate_rows = db.Column(db.String, nullable=True)
+    duplicate_rows_percent = db.Column(db.String, nullable=True)
+
+
+def upgrade_datasets_table():
+    # db.create_all() never alters an existing table, so columns and indexes added
+    # to Dataset after a deployment's table was created are added here. Every
+    # statement is idempotent, so this runs at each startup and from every worker.
+    engine = db.engine
+    table = Dataset.__table__
+    inspector = inspect(engine)
+    if not inspector.has_table(table.name):
+        return
+
+    existing = {column['name'] for column in inspector.get_columns(table.name)}
+    # Postgres also guards against another worker adding the column concurrently.
+    if_not_exists = 'IF NOT EXISTS ' if engine.dialect.name == 'postgresql' else ''
+
+    with engine.begin() as conn:
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            column_type = column.type.compile(dialect=engine.dialect)
+            conn.execute(text(
+                f'ALTER TABLE {table.name} ADD COLUMN {if_not_exists}{column.name} {column_type}'
+            ))
+
+        for index in table.indexes:
+            columns = ', '.join(column.name for column in index.columns)
+            conn.execute(text(
+                f'CREATE INDEX IF NOT EXISTS {index.name} ON {table.name} ({columns})'
+            ))
@@ -1,15 +1,26 @@
 import os
+import base64
+import gzip
+import hashlib
 import json
+import math
+import pickle
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from flask import (
     session, render_template, request, redirect,
-    url_for, flash, send_file
+    url_for, flash, send_file, jsonify
 )
 from werkzeug.utils import secure_filename
 from app import app, db
 from flask_login import current_user, login_required
-from models import Dataset
+from models import Dataset, upgrade_datasets_table
+from sqlalchemy import or_
+import numpy as np
 import pandas as pd
-from datetime import datetime
+import pyarrow as pa
+from datetime import datetime, timedelta
+from ydata_profiling import ProfileReport
 
 # Updated Quality Functions
 from quality import (
@@ -22,6 +33,24 @@ from quality import (
 )
 
 ALLOWED_EXTENSIONS = {'csv', 'xlsx', 'xls'}
+# Resolved once at import; the upload folder does not change while the app runs.
+UPLOAD_FOLDER = app.config['UPLOAD_FOLDER']
+ROWS_PER_PAGE = 100
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+# Bump when the layout of the pickled quality results changes.
+QUALITY_CACHE_VERSION = 4
+# Default for app.config["MAX_PROFILE_ROWS"]; larger frames are sampled before analysis.
+MAX_PROFILE_ROWS = 500_000
+
+# Bring tables created before the latest Dataset columns up to date.
+with app.app_context():
+    upgrade_datasets_table()
+
+# Profile reports take minutes on large files, so they are built off the request thread.
+profile_executor = ThreadPoolExecutor(max_workers=2)
+# A job still "pending" after this long is assumed lost (worker killed, recycled
+# or redeployed mid-run) and may be claimed again.
+PROFILE_JOB_TIMEOUT = timedelta(hours=1)
 
 
 # ===================================================
@@ -32,20 +61,335 @@ def allowed_file(filename):
 
 
 def load_df(filepath: str, original_name: str) -> pd.DataFrame:
+    # Prefer the Parquet copy written at upload time; it loads without any text parsing.
+    parquet_path = f"{filepath}.parquet"
+    if os.path.exists(parquet_path):
+        return pd.read_parquet(parquet_path, engine="pyarrow", dtype_backend="pyarrow")
+
     ext = original_name.lower().rsplit('.', 1)[-1]
 
     if ext in ("xlsx", "xls"):
+        # Spreadsheet columns often mix numbers and text, which an Arrow-typed
+        # column cannot hold, so workbooks keep NumPy dtypes.
         return pd.read_excel(filepath)
 
     if ext == "csv":
+        # Arrow-backed columns store strings far more compactly than NumPy object arrays.
+        try:
+            df = pd.read_csv(filepath, encoding="utf-8", engine="pyarrow", dtype_backend="pyarrow")
+        except pa.ArrowInvalid:
+            df = None
+
+        # The pyarrow engine reads invalid UTF-8 into binary columns and keeps
+        # duplicate headers as-is; such files go through the C parser, which
+        # falls back to latin1 and renames duplicates (a, a.1) as before.
+        if df is not None and not df.columns.has_duplicates and not any(
+            isinstance(dtype, pd.ArrowDtype)
+            and (pa.types.is_binary(dtype.pyarrow_dtype) or pa.types.is_large_binary(dtype.pyarrow_dtype))
+            for dtype in df.dtypes
+        ):
+            return df
+
         try:
-            return pd.read_csv(filepath, encoding="utf-8")
+            return pd.read_csv(filepath, encoding="utf-8", dtype_backend="pyarrow")
         except UnicodeDecodeError:
-            return pd.read_csv(filepath, encoding="latin1")
+            return pd.read_csv(filepath, encoding="latin1", dtype_backend="pyarrow")
 
     raise ValueError(f"Unsupported file extension: {ext}")
 
 
+def to_numpy_backed(df: pd.DataFrame) -> pd.DataFrame:
+    # load_df returns Arrow-backed columns, but ydata-profiling and the quality
+    # detectors expect classic NumPy dtypes (int64[pyarrow] with nulls would reach
+    # them as object arrays holding pd.NA). Convert at that boundary.
+    if not any(isinstance(dtype, pd.ArrowDtype) for dtype in df.dtypes):
+        return df
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    # ignore_metadata: otherwise the stored pandas dtypes (the Arrow ones) come back.
+    return table.to_pandas(ignore_metadata=True, date_as_object=False)
+
+
+def max_profile_rows() -> int:
+    return app.config.get("MAX_PROFILE_ROWS", MAX_PROFILE_ROWS)
+
+
+def sample_df(df: pd.DataFrame) -> pd.DataFrame:
+    max_rows = max_profile_rows()
+    if len(df) <= max_rows:
+        return df
+
+    # Deterministic sample, kept in file order with a fresh RangeIndex so
+    # detector indices stay positional.
+    return df.sample(n=max_rows, random_state=42).sort_index().reset_index(drop=True)
+
+
+def arrow_ipc_b64(df: pd.DataFrame):
+    # Tables are shipped to the browser as base64 Arrow IPC streams and rendered
+    # client-side (see templates/_macros.html) instead of via DataFrame.to_html.
+    if df.empty:
+        return None
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Object columns holding mixed Python types have no Arrow equivalent.
+        table = pa.Table.from_pandas(df.astype(str), preserve_index=False)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")
+
+
+def quality_cache_path(dataset) -> str:
+    return os.path.join(UPLOAD_FOLDER, f"quality_{dataset.id}.pkl")
+
+
+def read_quality_cache(dataset, mtime: float):
+    # Quality results are pickled next to the upload and reused by every worker
+    # until the source file changes, so filter switches skip recomputation.
+    cache_path = quality_cache_path(dataset)
+    if not os.path.exists(cache_path):
+        return None
+
+    try:
+        with open(cache_path, "rb") as fh:
+            cached = pickle.load(fh)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+    # Results built under a different row cap describe a different sample.
+    if (
+        cached.get("version") != QUALITY_CACHE_VERSION
+        or cached.get("mtime") != mtime
+        or cached.get("max_rows") != max_profile_rows()
+    ):
+        return None
+    return cached
+
+
+def write_quality_cache(dataset, results: dict) -> None:
+    cache_path = quality_cache_path(dataset)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as fh:
+        pickle.dump(results, fh, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(tmp_path, cache_path)
+
+
+def build_merged_outliers(df: pd.DataFrame, out_tbl: dict) -> pd.DataFrame:
+    # One row per (row, detector) pair, so each ?filter= view matches its header
+    # count; the rows for all detectors are gathered in a single take().
+    groups = [
+        (label, np.asarray(idx, dtype=np.int64))
+        for label, idx in (
+            ("Statistical", out_tbl.get("statistical_indices", [])),
+            ("AI-Based", out_tbl.get("semantic_indices", [])),
+            ("Structural", out_tbl.get("structural_indices", [])),
+        )
+        if len(idx)
+    ]
+    if not groups:
+        return pd.DataFrame()
+
+    positions = np.concatenate([idx for _, idx in groups])
+    labels = np.repeat([label for label, _ in groups], [len(idx) for _, idx in groups])
+
+    # load_df always returns a default RangeIndex, so labels are positions and a
+    # positional gather avoids per-label index lookups. take() already copies.
+    merged_df = df.take(positions).reset_index(drop=True)
+    merged_df["__outlier_type__"] = pd.Categorical(
+        labels, categories=["Statistical", "AI-Based", "Structural"]
+    )
+    return merged_df
+
+
+def build_quality_results(df: pd.DataFrame, mtime: float, total_rows: int) -> dict:
+    out_tbl = detect_outliers(df)
+    return {
+        "version": QUALITY_CACHE_VERSION,
+        "mtime": mtime,
+        "max_rows": max_profile_rows(),
+        "analyzed_rows": len(df),
+        "total_rows": total_rows,
+        "missing": detect_missing(df),
+        "duplicates": detect_duplicates(df),
+        "outliers": out_tbl,
+        "merged_outliers": build_merged_outliers(df, out_tbl),
+        # Label issues depend on the chosen target, so they are cached per column.
+        "labels": {},
+    }
+
+
+def store_column_info(dataset, df: pd.DataFrame) -> None:
+    # Column names and the auto-detected target are fixed per upload, so they
+    # live on the row; "" records that no target column was found.
+    dataset.columns_json = json.dumps([str(col) for col in df.columns])
+    dataset.detected_target = auto_detect_target_column(df) or ""
+
+
+def store_profile_stats(dataset, html_path: str) -> None:
+    # Pull the overview scalars out of the ydata report once and keep them on the row.
+    # Values the report does not yield are stored as "N/A", so the row never looks
+    # unextracted again and the HTML is not re-parsed on later requests.
+    stats = extract_ydata_overview_stats(html_path) or {}
+    for key in ("missing_cells", "missing_cells_percent", "duplicate_rows", "duplicate_rows_percent"):
+        value = stats.get(key)
+        setattr(dataset, key, str(value) if value is not None else "N/A")
+
+
+def store_frame_stats(dataset, df: pd.DataFrame) -> None:
+    # Same overview scalars, computed directly from a frame (the full data when the
+    # report itself was built from a sample).
+    total_cells = df.size or 1
+    total_rows = len(df) or 1
+    missing = int(df.isna().sum().sum())
+    duplicates = int(df.duplicated().sum())
+    dataset.missing_cells = str(missing)
+    dataset.missing_cells_percent = f"{missing / total_cells * 100:.1f}%"
+    dataset.duplicate_rows = str(duplicates)
+    dataset.duplicate_rows_percent = f"{duplicates / total_rows * 100:.1f}%"
+
+
+def claim_profile_job(dataset_id: int) -> bool:
+    # Atomically flips the row to "pending" (and not generated, so an upgrade shows
+    # the progress page); of several concurrent requests only the one whose UPDATE
+    # matched goes on to submit the job.
+    now = datetime.now()
+    claimed = (
+        Dataset.query
+        .filter(
+            Dataset.id == dataset_id,
+            or_(
+                Dataset.profile_status.is_(None),
+                Dataset.profile_status != "pending",
+                Dataset.profile_started_at.is_(None),
+                Dataset.profile_started_at < now - PROFILE_JOB_TIMEOUT,
+            ),
+        )
+        .update(
+            {"profile_status": "pending", "profile_started_at": now, "profile_generated": False},
+            synchronize_session=False,
+        )
+    )
+    db.session.commit()
+    return claimed == 1
+
+
+def profile_job_is_stale(dataset) -> bool:
+    return (
+        dataset.profile_status == "pending"
+        and (
+            dataset.profile_started_at is None
+            or dataset.profile_started_at < datetime.now() - PROFILE_JOB_TIMEOUT
+        )
+    )
+
+
+def dataset_exists(dataset_id: int) -> bool:
+    return db.session.query(Dataset.id).filter_by(id=dataset_id).first() is not None
+
+
+def remove_profile_files(profile_path: str) -> None:
+    for path in (profile_path, f"{profile_path}.gz"):
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def generate_profile(dataset_id: int) -> None:
+    # Runs on profile_executor; the request that queued it has already returned.
+    with app.app_context():
+        dataset = Dataset.query.get(dataset_id)
+        if dataset is None:
+            return
+
+        profile_path = None
+        try:
+            filepath = os.path.join(UPLOAD_FOLDER, dataset.filename)
+            full_df = load_df(filepath, dataset.original_filename)
+            df = to_numpy_backed(sample_df(full_df))
+
+            title = f"Profile - {dataset.original_filename}"
+            sampled = len(df) < len(full_df)
+            if sampled:
+                title += f" (random sample of {len(df):,} of {len(full_df):,} rows)"
+                # The report's overview would only describe the sample, so the
+                # dataset-wide missing/duplicate figures come from the full frame.
+                store_frame_stats(dataset, full_df)
+            del full_df
+            profile_filename = f"profile_{dataset.id}.html"
+            profile_path = os.path.join(UPLOAD_FOLDER, profile_filename)
+
+            while True:
+                full = bool(dataset.profile_full_requested)
+
+                if full:
+                    profile = ProfileReport(df, title=title, explorative=True)
+                else:
+                    # Correlations, interactions and bayesian-blocks histograms dominate
+                    # profiling time; they are only computed for the opt-in full report.
+                    profile = ProfileReport(
+                        df,
+                        title=title,
+                        minimal=True,
+                        correlations={
+                            "pearson": {"calculate": False},
+                            "spearman": {"calculate": False},
+                            "kendall": {"calculate": False},
+                            "phi_k": {"calculate": False},
+                            "cramers": {"calculate": False},
+                        },
+                        interactions=None,
+                        plot={"histogram": {"bayesian_blocks_bins": False}},
+                    )
+
+                profile.to_file(profile_path)
+                if not sampled:
+                    store_profile_stats(dataset, profile_path)
+
+                # Precompressed copy served to clients that accept gzip.
+                with open(profile_path, "rb") as src, gzip.open(f"{profile_path}.gz", "wb") as dst:
+                    shutil.copyfileobj(src, dst)
+
+                # The dataset may have been deleted while the report was built;
+                # delete_dataset has already run, so the files are ours to remove.
+                if not dataset_exists(dataset_id):
+                    remove_profile_files(profile_path)
+                    db.session.rollback()
+                    return
+
+                dataset.profile_path = profile_filename
+                dataset.profile_full = full
+                db.session.commit()
+
+                # A ?full=1 request that arrived while this run was in flight is
+                # served by another pass before the report is marked ready.
+                if not (dataset.profile_full_requested and not dataset.profile_full):
+                    break
+
+            dataset.profile_generated = True
+            dataset.profile_status = "ready"
+            db.session.commit()
+
+        except Exception as e:
+            db.session.rollback()
+            if not dataset_exists(dataset_id):
+                # Deleted mid-run: the commit failed on the missing row and the
+                # report written for it would otherwise be orphaned.
+                if profile_path is not None:
+                    remove_profile_files(profile_path)
+                return
+
+            app.logger.exception("Profile generation failed for dataset %s", dataset_id)
+            try:
+                dataset.profile_status = "failed"
+                dataset.profile_error = str(e)
+                dataset.profile_full_requested = False
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                app.logger.exception("Could not record profile failure for dataset %s", dataset_id)
+
+
 @app.before_request
 def make_session_permanent():
     session.permanent = True
@@ -94,17 +438,49 @@ def upload():
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             final_name = f"{current_user.id}_{timestamp}_{filename}"
 
-            os.makedirs(app.config['UPLOAD_FOLDER'], exist_ok=True)
-            filepath = os.path.join(app.config['UPLOAD_FOLDER'], final_name)
-            file.save(filepath)
+            # UPLOAD_FOLDER is created once at app startup.
+            filepath = os.path.join(UPLOAD_FOLDER, final_name)
+
+            # Copy the upload in fixed 1 MB chunks, hashing and sizing it in the same pass.
+            digest = hashlib.sha256()
+            file_size = 0
+            with open(filepath, "wb") as fh:
+                while chunk := file.stream.read(UPLOAD_CHUNK_SIZE):
+                    digest.update(chunk)
+                    fh.write(chunk)
+                    file_size += len(chunk)
 
             dataset = Dataset(
                 user_id=current_user.id,
                 filename=final_name,
                 original_filename=filename,
-                file_size=os.path.getsize(filepath),
+                file_size=file_size,
+                sha256=digest.hexdigest(),
             )
 
+            # Parse once up front: a file load_df cannot read is rejected here
+            # instead of failing later on every profile and quality request.
+            try:
+                df = load_df(filepath, filename)
+                store_column_info(dataset, to_numpy_backed(sample_df(df)))
+            except Exception as e:
+                os.remove(filepath)
+                flash(f'Could not read {filename}: {e}', 'error')
+                return redirect(request.url)
+
+            # Cache as Parquet so later requests skip CSV/Excel parsing. Frames
+            # Parquet cannot store (e.g. Excel columns mixing numbers and text)
+            # keep being read from the uploaded file.
+            parquet_file = f"{filepath}.parquet"
+            try:
+                df.to_parquet(parquet_file, engine="pyarrow", compression="zstd")
+                dataset.parquet_path = f"{final_name}.parquet"
+            except Exception as e:
+                app.logger.warning("Could not cache %s as Parquet: %s", final_name, e)
+                # load_df prefers the Parquet file, so never leave a partial one behind.
+                if os.path.exists(parquet_file):
+                    os.remove(parquet_file)
+
             db.session.add(dataset)
             db.session.commit()
 
@@ -123,40 +499,40 @@ def upload():
 @app.route('/profile/<int:dataset_id>')
 @login_required
 def profile_dataset(dataset_id):
-    dataset = Dataset.query.get_or_404(dataset_id)
-
-    if dataset.user_id != current_user.id:
-        flash('Access denied.', 'error')
-        return redirect(url_for('dashboard'))
+    dataset = Dataset.query.filter_by(id=dataset_id, user_id=current_user.id).first_or_404()
 
-    if not dataset.profile_generated:
-        try:
-            from ydata_profiling import ProfileReport
+    # ?full=1 asks for the full explorative analysis. The request is recorded on
+    # the row so a run that is already in flight picks it up before finishing.
+    if request.args.get("full") == "1" and not dataset.profile_full and not dataset.profile_full_requested:
+        dataset.profile_full_requested = True
+        db.session.commit()
 
-            filepath = os.path.join(app.config["UPLOAD_FOLDER"], dataset.filename)
-            df = load_df(filepath, dataset.original_filename)
+    upgrade_pending = dataset.profile_full_requested and not dataset.profile_full
 
-            profile = ProfileReport(
-                df,
-                title=f"Profile - {dataset.original_filename}",
-                explorative=True
-            )
+    if not dataset.profile_generated or upgrade_pending:
+        if dataset.profile_status == "failed":
+            error = dataset.profile_error
+            dataset.profile_status = None
+            dataset.profile_error = None
+            db.session.commit()
+            flash(f"Error generating profile: {error}", "error")
+            return redirect(url_for("dashboard"))
 
-            profile_filename = f"profile_{dataset.id}.html"
-            profile_path = os.path.join(app.config["UPLOAD_FOLDER"], profile_filename)
-            profile.to_file(profile_path)
+        if claim_profile_job(dataset.id):
+            profile_executor.submit(generate_profile, dataset.id)
 
-            dataset.profile_generated = True
-            dataset.profile_path = profile_filename
-            db.session.commit()
+    return render_template("profile.html", dataset=dataset, user=current_user)
 
-            flash("Profile report generated!", "success")
 
-        except Exception as e:
-            flash(f"Error generating profile: {e}", "error")
-            return redirect(url_for("dashboard"))
+@app.route('/profile_status/<int:dataset_id>')
+@login_required
+def profile_status(dataset_id):
+    dataset = Dataset.query.filter_by(id=dataset_id, user_id=current_user.id).first_or_404()
 
-    return render_template("profile.html", dataset=dataset, user=current_user)
+    return jsonify({
+        "generated": bool(dataset.profile_generated),
+        "status": "stale" if profile_job_is_stale(dataset) else dataset.profile_status,
+    })
 
 
 # ===================================================
@@ -165,11 +541,7 @@ def profile_dataset(dataset_id):
 @app.route('/view_profile/<int:dataset_id>')
 @login_required
 def view_profile(dataset_id):
-    dataset = Dataset.query.get_or_404(dataset_id)
-
-    if dataset.user_id != current_user.id:
-        flash("Access denied.", "error")
-        return redirect(url_for("dashboard"))
+    dataset = Dataset.query.filter_by(id=dataset_id, user_id=current_user.id).first_or_404()
 
     if not dataset.profile_generated:
         return redirect(url_for("profile_dataset", dataset_id=dataset_id))
@@ -180,16 +552,33 @@ def view_profile(dataset_id):
 @app.route('/profile_report/<int:dataset_id>')
 @login_required
 def profile_report(dataset_id):
-    dataset = Dataset.query.get_or_404(dataset_id)
-
-    if dataset.user_id != current_user.id:
-        return "Access denied", 403
+    dataset = Dataset.query.filter_by(id=dataset_id, user_id=current_user.id).first_or_404()
 
     if not dataset.profile_generated:
         return "Profile not generated", 404
 
-    filepath = os.path.join(app.config["UPLOAD_FOLDER"], dataset.profile_path)
-    return send_file(filepath)
+    filepath = os.path.join(UPLOAD_FOLDER, dataset.profile_path)
+    gz_path = f"{filepath}.gz"
+
+    if "gzip" in request.accept_encodings and os.path.exists(gz_path):
+        response = send_file(
+            gz_path,
+            mimetype="text/html",
+            conditional=True,
+            etag=True,
+            last_modified=os.path.getmtime(gz_path),
+        )
+        response.headers["Content-Encoding"] = "gzip"
+    else:
+        response = send_file(
+            filepath,
+            conditional=True,
+            etag=True,
+            last_modified=os.path.getmtime(filepath),
+        )
+
+    response.headers["Vary"] = "Accept-Encoding"
+    return response
 
 
 # ===================================================
@@ -198,21 +587,28 @@ def profile_report(dataset_id):
 @app.route('/delete/<int:dataset_id>', methods=['POST'])
 @login_required
 def delete_dataset(dataset_id):
-    dataset = Dataset.query.get_or_404(dataset_id)
-
-    if dataset.user_id != current_user.id:
-        flash("Access denied.", "error")
-        return redirect(url_for('dashboard'))
+    dataset = Dataset.query.filter_by(id=dataset_id, user_id=current_user.id).first_or_404()
 
     try:
-        file_path = os.path.join(app.config["UPLOAD_FOLDER"], dataset.filename)
+        file_path = os.path.join(UPLOAD_FOLDER, dataset.filename)
         if os.path.exists(file_path):
             os.remove(file_path)
 
+        if dataset.parquet_path:
+            parquet_file = os.path.join(UPLOAD_FOLDER, dataset.parquet_path)
+            if os.path.exists(parquet_file):
+                os.remove(parquet_file)
+
+        quality_file = quality_cache_path(dataset)
+        if os.path.exists(quality_file):
+            os.remove(quality_file)
+
         if dataset.profile_path:
-            profile_file = os.path.join(app.config["UPLOAD_FOLDER"], dataset.profile_path)
+            profile_file = os.path.join(UPLOAD_FOLDER, dataset.profile_path)
             if os.path.exists(profile_file):
                 os.remove(profile_file)
+            if os.path.exists(f"{profile_file}.gz"):
+                os.remove(f"{profile_file}.gz")
 
         db.session.delete(dataset)
         db.session.commit()
@@ -230,11 +626,7 @@ def delete_dataset(dataset_id):
 @app.route("/change_target_column/<int:dataset_id>", methods=["POST"])
 @login_required
 def change_target_column(dataset_id):
-    dataset = Dataset.query.get_or_404(dataset_id)
-
-    if dataset.user_id != current_user.id:
-        flash("Access denied.", "error")
-        return redirect(url_for("dashboard"))
+    dataset = Dataset.query.filter_by(id=dataset_id, user_id=current_user.id).first_or_404()
 
     new_target = request.form.get("target_col")
     if not new_target:
@@ -255,29 +647,49 @@ def change_target_column(dataset_id):
 @login_required
 def quality_issues(dataset_id):
 
-    dataset = Dataset.query.get_or_404(dataset_id)
-    dataset_path = os.path.join(app.config["UPLOAD_FOLDER"], dataset.filename)
-    df = load_df(dataset_path, dataset.original_filename)
+    dataset = Dataset.query.filter_by(id=dataset_id, user_id=current_user.id).first_or_404()
+    dataset_path = os.path.join(UPLOAD_FOLDER, dataset.filename)
+
+    # The DataFrame is only loaded when something below is not cached yet;
+    # re-renders with another filter or page are served without it.
+    df = None
+    total_rows = None
+
+    def frame() -> pd.DataFrame:
+        nonlocal df, total_rows
+        if df is None:
+            full_df = load_df(dataset_path, dataset.original_filename)
+            total_rows = len(full_df)
+            df = to_numpy_backed(sample_df(full_df))
+        return df
 
     # ===================================================
     # YDATA SUMMARY
     # ===================================================
-    y_stats = None
-    if dataset.profile_generated and dataset.profile_path:
-        html_path = os.path.join(app.config["UPLOAD_FOLDER"], dataset.profile_path)
-        y_stats = extract_ydata_overview_stats(html_path)
+    if dataset.profile_generated and dataset.profile_path and dataset.missing_cells is None:
+        # Reports generated before the stats were stored on the row: backfill once.
+        store_profile_stats(dataset, os.path.join(UPLOAD_FOLDER, dataset.profile_path))
+        db.session.commit()
 
-    y_missing_cells = y_stats.get("missing_cells", "N/A") if y_stats else "N/A"
-    y_missing_percent = y_stats.get("missing_cells_percent", "N/A") if y_stats else "N/A"
-    y_dup_rows = y_stats.get("duplicate_rows", "N/A") if y_stats else "N/A"
-    y_dup_percent = y_stats.get("duplicate_rows_percent", "N/A") if y_stats else "N/A"
+    y_missing_cells = dataset.missing_cells or "N/A"
+    y_missing_percent = dataset.missing_cells_percent or "N/A"
+    y_dup_rows = dataset.duplicate_rows or "N/A"
+    y_dup_percent = dataset.duplicate_rows_percent or "N/A"
 
     # ===================================================
     # LOCAL ANALYSIS
     # ===================================================
-    miss_tbl = detect_missing(df)
-    dup_tbl = detect_duplicates(df)
-    out_tbl = detect_outliers(df)
+    mtime = os.path.getmtime(dataset_path)
+    quality = read_quality_cache(dataset, mtime)
+    if quality is None:
+        analysis_df = frame()
+        quality = build_quality_results(analysis_df, mtime, total_rows)
+        write_quality_cache(dataset, quality)
+
+    miss_tbl = quality["missing"]
+    dup_tbl = quality["duplicates"]
+    out_tbl = quality["outliers"]
+    merged_df = quality["merged_outliers"]
 
     structural_idx = out_tbl.get("structural_indices", [])
     statistical_idx = out_tbl.get("statistical_indices", [])
@@ -286,86 +698,71 @@ def quality_issues(dataset_id):
     # ===================================================
     # MERGED OUTLIERS TABLE (WITH FILTER)
     # ===================================================
-    merged_rows = []
-
-    if statistical_idx:
-        temp = df.loc[statistical_idx].copy()
-        temp["__outlier_type__"] = "Statistical"
-        merged_rows.append(temp)
-
-    if semantic_idx:
-        temp = df.loc[semantic_idx].copy()
-        temp["__outlier_type__"] = "AI-Based"
-        merged_rows.append(temp)
-
-    if structural_idx:
-        temp = df.loc[structural_idx].copy()
-        temp["__outlier_type__"] = "Structural"
-        merged_rows.append(temp)
-
-    merged_df = pd.concat(merged_rows, ignore_index=True) if merged_rows else pd.DataFrame()
-
     # filter ?filter=...
     selected_filter = request.args.get("filter", "all").lower()
+    filter_labels = {"statistical": "Statistical", "ai": "AI-Based", "structural": "Structural"}
 
-    if selected_filter == "statistical":
-        filtered_df = merged_df[merged_df["__outlier_type__"] == "Statistical"]
-    elif selected_filter == "ai":
-        filtered_df = merged_df[merged_df["__outlier_type__"] == "AI-Based"]
-    elif selected_filter == "structural":
-        filtered_df = merged_df[merged_df["__outlier_type__"] == "Structural"]
+    if selected_filter in filter_labels and not merged_df.empty:
+        filtered_df = merged_df[merged_df["__outlier_type__"] == filter_labels[selected_filter]]
     else:
         filtered_df = merged_df
 
-    merged_table_html = (
-        filtered_df.to_html(classes="table table-bordered table-sm", index=False)
-        if not filtered_df.empty else "<p>No outliers found for this category.</p>"
-    )
+    # Only one page of outlier rows is serialized into the response.
+    outlier_rows = len(filtered_df)
+    page_count = max(math.ceil(outlier_rows / ROWS_PER_PAGE), 1)
+    page = min(max(request.args.get("page", 1, type=int), 1), page_count)
+    page_start = (page - 1) * ROWS_PER_PAGE
+    page_df = filtered_df.iloc[page_start:page_start + ROWS_PER_PAGE]
+
+    merged_arrow = arrow_ipc_b64(page_df)
 
     # ===================================================
     # TARGET COLUMN DETECTION
     # ===================================================
+    if dataset.columns_json is None or dataset.detected_target is None:
+        # Datasets uploaded before these were stored at upload time.
+        store_column_info(dataset, frame())
+        db.session.commit()
+
+    df_columns = json.loads(dataset.columns_json)
+
     session_key = f"manual_target_column_{dataset.id}"
     manual_target = session.get(session_key)
 
-    if manual_target and manual_target in df.columns:
+    if manual_target and manual_target in df_columns:
         detected_target = manual_target
     else:
-        detected_target = auto_detect_target_column(df)
-        if manual_target and manual_target not in df.columns:
+        detected_target = dataset.detected_target or None
+        if manual_target and manual_target not in df_columns:
             session.pop(session_key, None)
 
     # ===================================================
     # LABEL ISSUES
     # ===================================================
-    labels_info = detect_label_issues(df, target_col=detected_target)
+    label_cache = quality.setdefault("labels", {})
+    if detected_target not in label_cache:
+        label_cache[detected_target] = detect_label_issues(frame(), target_col=detected_target)
+        write_quality_cache(dataset, quality)
+
+    labels_info = label_cache[detected_target]
 
     label_issue_count = labels_info.get("label_issue_count", 0)
     label_note = labels_info.get("note")
     label_preview_rows = labels_info.get("preview", [])
 
-    label_df = pd.DataFrame(label_preview_rows)
-    label_table = (
-        label_df.to_html(classes="table table-bordered table-sm", index=False)
-        if not label_df.empty else ""
-    )
+    label_df = pd.DataFrame(label_preview_rows).head(ROWS_PER_PAGE)
+    label_arrow = arrow_ipc_b64(label_df)
 
     # ===================================================
     # Missing Table
     # ===================================================
-    missing_table = (
-        miss_tbl.to_html(classes="table table-bordered", index=False)
-        if not miss_tbl.empty else "<p>No missing values found.</p>"
-    )
+    missing_arrow = arrow_ipc_b64(miss_tbl)
 
     # ===================================================
     # Duplicate Preview
     # ===================================================
-    dup_prev_df = pd.DataFrame(dup_tbl.get("preview", []))
-    dup_preview_html = (
-        dup_prev_df.to_html(classes="table table-bordered table-sm", index=False)
-        if not dup_prev_df.empty else "<p>No duplicate rows found.</p>"
-    )
+    dup_prev_df = pd.DataFrame(dup_tbl.get("preview", [])).head(ROWS_PER_PAGE)
+    dup_preview_arrow = arrow_ipc_b64(dup_prev_df)
 
     duplicate_table = f"""
     <table class='table table-bordered table-sm'>
@@ -387,15 +784,20 @@ def quality_issues(dataset_id):
         dataset=dataset,
 
         # Missing
-        missing_table=missing_table,
+        missing_arrow=missing_arrow,
 
         # Duplicates
         duplicate_table=duplicate_table,
-        dup_preview_html=dup_preview_html,
+        dup_preview_arrow=dup_preview_arrow,
 
         # Outliers (merged)
-        merged_table=merged_table_html,
+        merged_arrow=merged_arrow,
         selected_filter=selected_filter,
+        page=page,
+        page_count=page_count,
+        page_start=page_start,
+        page_end=page_start + len(page_df),
+        outlier_rows=outlier_rows,
         outlier_total=out_tbl.get("outlier_count", 0),
 
         # Individual outlier counts (for header use)
@@ -405,7 +807,7 @@ def quality_issues(dataset_id):
 
         # Labels
         label_issue_count=label_issue_count,
-        label_table=label_table,
+        label_arrow=label_arrow,
         label_note=label_note,
 
         # YData summary
@@ -415,5 +817,9 @@ def quality_issues(dataset_id):
         y_dup_percent=y_dup_percent,
 
         detected_target=detected_target,
-        df_columns=df.columns.tolist(),
+        df_columns=df_columns,
+
+        # Sampling
+        analyzed_rows=quality["analyzed_rows"],
+        total_rows=quality["total_rows"],
     )